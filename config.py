@@ -2,10 +2,25 @@
 import os
 import sys
 import logging
-from dotenv import load_dotenv
+from collections import namedtuple
+
+# Configuración inmutable: se resuelve una vez en el proceso coordinador y se
+# pasa a los procesos hijos, que así no vuelven a leer el .env al importarse.
+Configuracion = namedtuple(
+    "Configuracion",
+    [
+        "db_host",
+        "db_port",
+        "db_name",
+        "db_user",
+        "db_pass",
+        "num_procesos",
+        "metodo_inicio",
+    ],
+)
+
+_configuracion = None
 
-# Cargar variables desde .env automáticamente
-load_dotenv()
 
 # Obtener variables o lanzar error si no existen
 def obtener_variable_entorno(var_nombre, default=None):
@@ -44,11 +59,48 @@ def obtener_entero_valido(nombre, default=None, min_val=1, max_val=32):
     return valor
 
 
-# Configuración de número de procesos
-NUM_PROCESOS = obtener_entero_valido("NUM_PROCESOS")
-# Configuración de la base de datos
-DB_HOST = obtener_variable_entorno("DB_HOST")
-DB_PORT = obtener_variable_entorno("DB_PORT")
-DB_NAME = obtener_variable_entorno("DB_NAME")
-DB_USER = obtener_variable_entorno("DB_USER")
-DB_PASS = obtener_variable_entorno("DB_PASS")
+# Verifica que el método de inicio de procesos exista en esta plataforma
+def obtener_metodo_inicio(nombre):
+    valor = os.getenv(nombre)
+    if not valor:
+        return None  # Se usa el método por defecto de la plataforma
+
+    import multiprocessing
+
+    metodos = multiprocessing.get_all_start_methods()
+    if valor not in metodos:
+        logging.error(
+            f"{nombre} debe ser uno de {', '.join(metodos)}. Valor recibido: '{valor}'"
+        )
+        sys.exit(1)
+        return
+    return valor
+
+
+# Lee el .env y valida todas las variables
+def cargar_configuracion():
+    # Importación diferida: solo el coordinador necesita dotenv
+    from dotenv import load_dotenv
+
+    # Cargar variables desde .env
+    load_dotenv()
+
+    return Configuracion(
+        # Configuración de la base de datos
+        db_host=obtener_variable_entorno("DB_HOST"),
+        db_port=obtener_variable_entorno("DB_PORT"),
+        db_name=obtener_variable_entorno("DB_NAME"),
+        db_user=obtener_variable_entorno("DB_USER"),
+        db_pass=obtener_variable_entorno("DB_PASS"),
+        # Configuración de número de procesos y método de inicio
+        num_procesos=obtener_entero_valido("NUM_PROCESOS"),
+        metodo_inicio=obtener_metodo_inicio("METODO_INICIO"),
+    )
+
+
+# Retorna la configuración, cargándola la primera vez que se pide
+def obtener_configuracion():
+    global _configuracion
+    if _configuracion is None:
+        _configuracion = cargar_configuracion()
+    return _configuracion
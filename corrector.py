@@ -1,22 +1,29 @@
 # Lógica de correción
 import time
-import config
 import logging
 from database import Database
 
 
-def procesar_estacion(station_pk):
+def procesar_estacion(station_pk, configuracion):
 
-    # Cada proceso debe crear su propia conexión
+    # Cada proceso debe crear su propia conexión con la configuración
+    # recibida del coordinador (no se vuelve a leer el .env)
     db = Database(
-        config.DB_HOST, config.DB_PORT, config.DB_NAME, config.DB_USER, config.DB_PASS
+        configuracion.db_host,
+        configuracion.db_port,
+        configuracion.db_name,
+        configuracion.db_user,
+        configuracion.db_pass,
     )
 
     if not db.conectar():
         logging.error(f"[Estación {station_pk}] Error: No se pudo conectar a la BD.")
-        return 0
+        return 0, 0, 0.0
 
     correcciones_totales = 0
+    # Motor por fila: filas recorridas (corregidas o no) y tiempo invertido
+    filas_procesadas = 0
+    tiempo_motor_filas = 0.0
     start_time = time.time()
 
     try:
@@ -34,37 +41,42 @@ def procesar_estacion(station_pk):
                 f"[Estación {station_pk}] Columna '{col}': Corrigiendo {len(errores)} errores..."
             )
 
-            for obs_pk, fecha_error, _ in errores:
+            inicio_filas = time.perf_counter()
+            try:
+                for obs_pk, fecha_error, _ in errores:
+                    filas_procesadas += 1
 
-                # Buscar Vecinos
-                val_ant = db.obtener_valor_anterior(station_pk, col, fecha_error)
-                val_post = db.obtener_valor_posterior(station_pk, col, fecha_error)
+                    # Buscar Vecinos
+                    val_ant = db.obtener_valor_anterior(station_pk, col, fecha_error)
+                    val_post = db.obtener_valor_posterior(station_pk, col, fecha_error)
 
-                valor_corregido = None
+                    valor_corregido = None
 
-                # Existen ambos se calcula promedio
-                if val_ant is not None and val_post is not None:
-                    valor_corregido = (val_ant + val_post) / 2
+                    # Existen ambos se calcula promedio
+                    if val_ant is not None and val_post is not None:
+                        valor_corregido = (val_ant + val_post) / 2
 
-                # Solo existe anterior mantenemos el último válido
-                elif val_ant is not None:
-                    valor_corregido = val_ant
+                    # Solo existe anterior mantenemos el último válido
+                    elif val_ant is not None:
+                        valor_corregido = val_ant
 
-                # Si solo existe posterior usamos el primero válido
-                elif val_post is not None:
-                    valor_corregido = val_post
+                    # Si solo existe posterior usamos el primero válido
+                    elif val_post is not None:
+                        valor_corregido = val_post
 
-                # Estación vacía o corrupta total se asigna 0
-                else:
-                    valor_corregido = 0
+                    # Estación vacía o corrupta total se asigna 0
+                    else:
+                        valor_corregido = 0
 
-                # Actualizar BD
-                if valor_corregido is not None:
-                    # Redondeamos a 2 decimales para ser
-                    valor_corregido = round(valor_corregido, 2)
+                    # Actualizar BD
+                    if valor_corregido is not None:
+                        # Redondeamos a 2 decimales para ser
+                        valor_corregido = round(valor_corregido, 2)
 
-                    if db.actualizar_observacion(obs_pk, col, valor_corregido):
-                        correcciones_totales += 1
+                        if db.actualizar_observacion(obs_pk, col, valor_corregido):
+                            correcciones_totales += 1
+            finally:
+                tiempo_motor_filas += time.perf_counter() - inicio_filas
 
     except Exception as e:
         logging.critical(
@@ -72,6 +84,9 @@ def procesar_estacion(station_pk):
         )
 
     finally:
+        # Se leen antes de cerrar: la caché es por conexión
+        preparadas = len(db.sentencias_preparadas)
+        ejecuciones = db.ejecuciones_preparadas
         db.cerrar_conexion()
 
     duration = time.time() - start_time
@@ -79,11 +94,20 @@ def procesar_estacion(station_pk):
         logging.info(
             f"--> [Estación {station_pk}] Finalizada. {correcciones_totales} correcciones en {duration:.2f}s."
         )
+    if filas_procesadas > 0:
+        ms_por_fila = tiempo_motor_filas * 1000 / filas_procesadas
+        logging.info(
+            f"    [Estación {station_pk}] Motor por fila: {filas_procesadas} filas en "
+            f"{tiempo_motor_filas:.2f}s ({ms_por_fila:.2f} ms/fila), {ejecuciones} "
+            f"ejecuciones sobre {preparadas} sentencias preparadas."
+        )
 
-    return correcciones_totales
+    return correcciones_totales, filas_procesadas, tiempo_motor_filas
 
 
 if __name__ == "__main__":
     # Prueba con la estación 1
+    import config
+
     print("Probando corrección de una sola estación...")
-    procesar_estacion(1)
+    procesar_estacion(1, config.obtener_configuracion())
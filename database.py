@@ -1,9 +1,38 @@
 # Conexión a PostgreSQL y ejecución de consultas
 import psycopg2
-import config  # archivo que lee variables de entorno
+from psycopg2 import sql
 import logging
 
 
+# Plantillas de las consultas del motor por fila. Se preparan una vez por
+# (tipo, columna) y conexión, y luego solo se ejecutan con EXECUTE.
+CONSULTAS_PREPARABLES = {
+    "anterior": """
+        SELECT {columna}
+        FROM meteo.observations
+        WHERE station_fk = $1
+          AND date_time < $2
+          AND {columna} != -32768
+        ORDER BY date_time DESC
+        LIMIT 1
+    """,
+    "posterior": """
+        SELECT {columna}
+        FROM meteo.observations
+        WHERE station_fk = $1
+          AND date_time > $2
+          AND {columna} != -32768
+        ORDER BY date_time ASC
+        LIMIT 1
+    """,
+    "actualizar": """
+        UPDATE meteo.observations
+        SET {columna} = $1
+        WHERE pk = $2
+    """,
+}
+
+
 ## Maneja la conexión y operaciones con PostgreSQL
 class Database:
     ## Inicializa parámetros de conexión
@@ -14,6 +43,11 @@ class Database:
         self.user = user
         self.password = password
         self.connection = None
+        # Esquema y sentencias preparadas de la conexión actual
+        self.columnas_numericas = None
+        self.esquema_fallido = False
+        self.sentencias_preparadas = {}
+        self.ejecuciones_preparadas = 0
 
     # Conecta a la base de datos PostgreSQL
     def conectar(self):
@@ -25,6 +59,7 @@ class Database:
                 user=self.user,
                 password=self.password,
             )
+            self._limpiar_cache()
             logging.info(f"Conexión exitosa a {self.dbname} en {self.host}:{self.port}")
             return True
 
@@ -43,8 +78,53 @@ class Database:
         if self.connection:
             self.connection.close()
             self.connection = None
+            self._limpiar_cache()
             logging.info("Conexión cerrada.")
 
+    def _limpiar_cache(self):
+        # Las sentencias preparadas solo existen dentro de una sesión
+        self.columnas_numericas = None
+        self.esquema_fallido = False
+        self.sentencias_preparadas = {}
+        self.ejecuciones_preparadas = 0
+
+    def _validar_columna(self, columna):
+        # Solo se aceptan columnas presentes en el esquema cacheado
+        # Si la consulta del esquema ya falló no se repite en cada fila;
+        # se reintenta al llamar de nuevo a obtener_columnas_numericas()
+        if self.columnas_numericas is None and not self.esquema_fallido:
+            self.obtener_columnas_numericas()
+        if self.columnas_numericas is None:
+            raise ValueError("No se pudo obtener el esquema de columnas numéricas")
+        if columna not in self.columnas_numericas:
+            raise ValueError(f"Columna no válida: '{columna}'")
+
+    def _ejecutar_preparada(self, cursor, tipo, columna, parametros):
+        # Prepara la sentencia la primera vez y luego solo la ejecuta.
+        # El EXECUTE se arma una sola vez y queda guardado junto al nombre.
+        clave = (tipo, columna)
+        preparada = self.sentencias_preparadas.get(clave)
+        if preparada is None:
+            self._validar_columna(columna)
+            nombre = f"{tipo}_{len(self.sentencias_preparadas)}"
+            cursor.execute(
+                sql.SQL("PREPARE {} AS {}").format(
+                    sql.Identifier(nombre),
+                    sql.SQL(CONSULTAS_PREPARABLES[tipo]).format(
+                        columna=sql.Identifier(columna)
+                    ),
+                )
+            )
+            # Texto plano: el nombre lo genera esta clase, no necesita
+            # componerse con psycopg2.sql en cada ejecución
+            marcadores = ", ".join(["%s"] * len(parametros))
+            sentencia_execute = f'EXECUTE "{nombre}" ({marcadores})'
+            preparada = (nombre, sentencia_execute)
+            self.sentencias_preparadas[clave] = preparada
+
+        cursor.execute(preparada[1], parametros)
+        self.ejecuciones_preparadas += 1
+
     def obtener_todas_las_estaciones(self):
         # Retorna una lista con los IDs de todas las estaciones
         if not self.connection:
@@ -84,9 +164,14 @@ class Database:
             resultados = cursor.fetchall()
             cursor.close()
             lista_columnas = [fila[0] for fila in resultados]
+            self.columnas_numericas = lista_columnas
+            self.esquema_fallido = False
             return lista_columnas
         except Exception as e:
+            self.connection.rollback()  # Salir de la transacción abortada
             logging.error(f"Error al obtener columnas numéricas: {e}")
+            # Se marca el fallo para no repetir la consulta en cada fila
+            self.esquema_fallido = True
             return []
 
     def obtener_valor_anterior(self, station_fk, columna, fecha_hora):
@@ -95,16 +180,9 @@ class Database:
             return None
         try:
             cursor = self.connection.cursor()
-            query = f"""
-                SELECT {columna}
-                FROM meteo.observations
-                WHERE station_fk = %s
-                  AND date_time < %s
-                  AND {columna} != -32768
-                ORDER BY date_time DESC
-                LIMIT 1
-            """
-            cursor.execute(query, (station_fk, fecha_hora))
+            self._ejecutar_preparada(
+                cursor, "anterior", columna, (station_fk, fecha_hora)
+            )
             resultado = cursor.fetchone()
             cursor.close()
             if resultado:
@@ -121,16 +199,9 @@ class Database:
             return None
         try:
             cursor = self.connection.cursor()
-            query = f"""
-                SELECT {columna}
-                FROM meteo.observations
-                WHERE station_fk = %s
-                  AND date_time > %s
-                  AND {columna} != -32768
-                ORDER BY date_time ASC
-                LIMIT 1
-            """
-            cursor.execute(query, (station_fk, fecha_hora))
+            self._ejecutar_preparada(
+                cursor, "posterior", columna, (station_fk, fecha_hora)
+            )
             resultado = cursor.fetchone()
             cursor.close()
             if resultado:
@@ -146,15 +217,18 @@ class Database:
             logging.warning("No hay conexión activa.")
             return []
         try:
+            self._validar_columna(columna)
             cursor = self.connection.cursor()
             # Registros con valor -32768
-            query = f"""
+            query = sql.SQL(
+                """
                         SELECT pk, date_time, {columna}
                         FROM meteo.observations
                         WHERE station_fk = %s
                         AND {columna} = -32768
                         ORDER BY date_time ASC
                     """
+            ).format(columna=sql.Identifier(columna))
             cursor.execute(query, (station_fk,))
             resultados = cursor.fetchall()
             cursor.close()
@@ -173,13 +247,7 @@ class Database:
         try:
             cursor = self.connection.cursor()
 
-            query = f"""
-                UPDATE meteo.observations
-                SET {columna} = %s
-                WHERE pk = %s
-            """
-
-            cursor.execute(query, (nuevo_valor, pk))
+            self._ejecutar_preparada(cursor, "actualizar", columna, (nuevo_valor, pk))
             self.connection.commit()  # Confirmar cambios
 
             return True
@@ -258,12 +326,13 @@ if __name__ == "__main__":
     # Leer credenciales desde variables de entorno
     import config
 
+    cfg = config.obtener_configuracion()
     db = Database(
-        host=config.DB_HOST,
-        port=config.DB_PORT,
-        dbname=config.DB_NAME,
-        user=config.DB_USER,
-        password=config.DB_PASS,
+        host=cfg.db_host,
+        port=cfg.db_port,
+        dbname=cfg.db_name,
+        user=cfg.db_user,
+        password=cfg.db_pass,
     )
     db.conectar()
     estaciones = db.obtener_todas_las_estaciones()
@@ -1,9 +1,10 @@
 # Unión de módulos y ejecución principal
-from multiprocessing import Pool
+import multiprocessing
 import time
 import config
 import sys
 import logging
+from functools import partial
 from database import Database
 from corrector import procesar_estacion
 
@@ -21,13 +22,16 @@ def main():
     inicio = time.time()
     logging.info("Iniciando proceso de corrección")
 
+    # Resolver la configuración una sola vez (los procesos la reciben)
+    cfg = config.obtener_configuracion()
+
     # Conectar a BDD
     db = Database(
-        host=config.DB_HOST,
-        port=config.DB_PORT,
-        dbname=config.DB_NAME,
-        user=config.DB_USER,
-        password=config.DB_PASS,
+        host=cfg.db_host,
+        port=cfg.db_port,
+        dbname=cfg.db_name,
+        user=cfg.db_user,
+        password=cfg.db_pass,
     )
 
     if not db.conectar():
@@ -55,13 +59,19 @@ def main():
     db.cerrar_conexion()
 
     # PROCESAMIENTO PARALELO
+    contexto = multiprocessing.get_context(cfg.metodo_inicio)
     logging.info(
-        f"Procesando estaciones en paralelo ({config.NUM_PROCESOS} procesos)..."
+        f"Procesando estaciones en paralelo ({cfg.num_procesos} procesos, "
+        f"método '{contexto.get_start_method()}')..."
     )
     resultados = []
     try:
-        with Pool(processes=config.NUM_PROCESOS) as pool:
-            resultados = pool.map(procesar_estacion, estaciones)
+        inicio_pool = time.time()
+        with contexto.Pool(processes=cfg.num_procesos) as pool:
+            resultados = pool.map(
+                partial(procesar_estacion, configuracion=cfg), estaciones
+            )
+        duracion_pool = time.time() - inicio_pool
 
     except KeyboardInterrupt:
         logging.warning("Proceso interrumpido por el usuario ")
@@ -74,11 +84,11 @@ def main():
 
     # Reconectar para obtener estadísticas finales
     db = Database(
-        host=config.DB_HOST,
-        port=config.DB_PORT,
-        dbname=config.DB_NAME,
-        user=config.DB_USER,
-        password=config.DB_PASS,
+        host=cfg.db_host,
+        port=cfg.db_port,
+        dbname=cfg.db_name,
+        user=cfg.db_user,
+        password=cfg.db_pass,
     )
     db.conectar()
 
@@ -86,7 +96,10 @@ def main():
     errores_despues_est = db.contar_errores_por_estacion()
 
     total_errores_final = sum(errores_despues_col.values())
-    total_corregido = sum(resultados)
+    # Cada estación retorna (correcciones, filas procesadas, tiempo motor por fila)
+    total_corregido = sum(r[0] for r in resultados)
+    total_filas_motor = sum(r[1] for r in resultados)
+    tiempo_motor = sum(r[2] for r in resultados)
 
     duracion = time.time() - inicio
 
@@ -100,7 +113,14 @@ def main():
     print(f"Valores corregidos: {total_corregido:,}")
     print(f"Errores restantes: {total_errores_final:,}")
     print(f"Tiempo de ejecución: {duracion:.2f} segundos")
-    print(f"Procesos utilizados: {config.NUM_PROCESOS}")
+    print(f"Tiempo del Pool de procesos: {duracion_pool:.2f} segundos")
+    if total_filas_motor > 0:
+        print(
+            f"Motor por fila: {tiempo_motor:.2f} segundos acumulados en "
+            f"{total_filas_motor:,} filas ({tiempo_motor * 1000 / total_filas_motor:.2f} ms/fila)"
+        )
+    print(f"Procesos utilizados: {cfg.num_procesos}")
+    print(f"Método de inicio: {contexto.get_start_method()}")
 
     print(f"\n Valores corregidos por columna:")
     for columna in sorted(errores_antes_col.keys()):
@@ -113,8 +133,8 @@ def main():
     print(f"\n Correcciones por estación:")
     # Combinar resultados con IDs de estación
     for i, station_pk in enumerate(estaciones):
-        if resultados[i] > 0:
-            print(f"Estación {station_pk:3d}: {resultados[i]:6,} valores corregidos")
+        if resultados[i][0] > 0:
+            print(f"Estación {station_pk:3d}: {resultados[i][0]:6,} valores corregidos")
 
     db.cerrar_conexion()
     print(f"\nProceso completado exitosamente")
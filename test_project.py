@@ -8,6 +8,17 @@ from database import Database
 
 from corrector import procesar_estacion
 
+# Configuración fija para las pruebas (no depende del .env)
+CONFIG_PRUEBA = config.Configuracion(
+    db_host="host",
+    db_port="5432",
+    db_name="db",
+    db_user="user",
+    db_pass="pass",
+    num_procesos=1,
+    metodo_inicio=None,
+)
+
 
 class TestConfiguracion(unittest.TestCase):
     # Pruebas para el módulo de configuración (config.py)
@@ -25,11 +36,20 @@ class TestConfiguracion(unittest.TestCase):
                 "NUM_PROCESOS": "4",
             },
         ):
-            import importlib
+            cfg = config.cargar_configuracion()
+            self.assertEqual(cfg.db_host, "test_host")
+            self.assertEqual(cfg.num_procesos, 4)
+
+    def test_configuracion_inmutable(self):
+        # La configuración no se puede modificar una vez creada
+        with self.assertRaises(AttributeError):
+            CONFIG_PRUEBA.db_host = "otro_host"
 
-            importlib.reload(config)
-            self.assertEqual(config.DB_HOST, "test_host")
-            self.assertEqual(config.NUM_PROCESOS, 4)
+    def test_metodo_inicio_invalido(self):
+        # Un método de inicio inexistente termina el programa
+        with patch.dict(os.environ, {"METODO_INICIO": "hilos"}):
+            with self.assertRaises(SystemExit):
+                config.obtener_metodo_inicio("METODO_INICIO")
 
 
 class TestDatabase(unittest.TestCase):
@@ -54,6 +74,59 @@ class TestDatabase(unittest.TestCase):
         resultado = db.conectar()
         self.assertFalse(resultado)
 
+    @patch("database.psycopg2.connect")
+    def test_sentencia_preparada_una_vez(self, mock_connect):
+        # La segunda llamada con la misma columna solo ejecuta EXECUTE
+        db = Database("host", "5432", "db", "user", "pass")
+        db.conectar()
+        db.columnas_numericas = ["temperature"]
+        cursor = mock_connect.return_value.cursor.return_value
+        cursor.fetchone.return_value = (10.0,)
+
+        self.assertEqual(db.obtener_valor_anterior(1, "temperature", "2023"), 10.0)
+        self.assertEqual(cursor.execute.call_count, 2)  # PREPARE + EXECUTE
+        self.assertEqual(db.obtener_valor_anterior(1, "temperature", "2023"), 10.0)
+        self.assertEqual(cursor.execute.call_count, 3)  # solo EXECUTE
+        # El EXECUTE se reutiliza tal cual, sin volver a armarlo
+        llamadas = cursor.execute.call_args_list
+        self.assertIs(llamadas[1].args[0], llamadas[2].args[0])
+        self.assertEqual(len(db.sentencias_preparadas), 1)
+        self.assertEqual(db.ejecuciones_preparadas, 2)
+
+    @patch("database.psycopg2.connect")
+    def test_esquema_fallido_se_consulta_una_vez(self, mock_connect):
+        # Si falla la consulta del esquema no se repite en cada fila
+        db = Database("host", "5432", "db", "user", "pass")
+        db.conectar()
+        cursor = mock_connect.return_value.cursor.return_value
+        cursor.execute.side_effect = Exception("Error simulado")
+
+        self.assertIsNone(db.obtener_valor_anterior(1, "temperature", "2023"))
+        self.assertIsNone(db.obtener_valor_posterior(1, "temperature", "2023"))
+        self.assertFalse(db.actualizar_observacion(1, "temperature", 0))
+        self.assertEqual(cursor.execute.call_count, 1)
+        self.assertIsNone(db.columnas_numericas)
+        self.assertTrue(db.esquema_fallido)
+        mock_connect.return_value.rollback.assert_called()
+
+        # Una llamada explícita vuelve a intentar la consulta
+        cursor.execute.side_effect = None
+        cursor.fetchall.return_value = [("temperature",)]
+        self.assertEqual(db.obtener_columnas_numericas(), ["temperature"])
+        self.assertFalse(db.esquema_fallido)
+
+    @patch("database.psycopg2.connect")
+    def test_columna_no_valida(self, mock_connect):
+        # Una columna fuera del esquema no llega a la base de datos
+        db = Database("host", "5432", "db", "user", "pass")
+        db.conectar()
+        db.columnas_numericas = ["temperature"]
+        cursor = mock_connect.return_value.cursor.return_value
+
+        resultado = db.actualizar_observacion(1, "pk; DROP TABLE x", 0)
+        self.assertFalse(resultado)
+        cursor.execute.assert_not_called()
+
 
 class TestLogicaCorreccion(unittest.TestCase):
     # Se simula la base de datos para testing
@@ -74,7 +147,7 @@ class TestLogicaCorreccion(unittest.TestCase):
         db.obtener_valor_posterior.return_value = 20.0
 
         # Ejecutar
-        procesar_estacion(99)
+        procesar_estacion(99, CONFIG_PRUEBA)
 
         # Verificación: (10 + 20) / 2 = 15.0
         db.actualizar_observacion.assert_called_with(1, "temperature", 15.0)
@@ -92,7 +165,7 @@ class TestLogicaCorreccion(unittest.TestCase):
         db.obtener_valor_anterior.return_value = 10.0
         db.obtener_valor_posterior.return_value = None
 
-        procesar_estacion(99)
+        procesar_estacion(99, CONFIG_PRUEBA)
 
         # Verificación: Debe usar 10.0
         db.actualizar_observacion.assert_called_with(2, "temperature", 10.0)
@@ -110,7 +183,7 @@ class TestLogicaCorreccion(unittest.TestCase):
         db.obtener_valor_anterior.return_value = None
         db.obtener_valor_posterior.return_value = 20.0
 
-        procesar_estacion(99)
+        procesar_estacion(99, CONFIG_PRUEBA)
 
         # Verificación: Debe usar 20.0
         db.actualizar_observacion.assert_called_with(3, "temperature", 20.0)
@@ -128,11 +201,31 @@ class TestLogicaCorreccion(unittest.TestCase):
         db.obtener_valor_anterior.return_value = None
         db.obtener_valor_posterior.return_value = None
 
-        procesar_estacion(99)
+        procesar_estacion(99, CONFIG_PRUEBA)
 
         # Verificación: Valor 0
         db.actualizar_observacion.assert_called_with(4, "temperature", 0)
 
+    @patch("corrector.Database")
+    def test_motor_cuenta_filas_no_corregidas(self, MockDatabase):
+        # Las filas cuya actualización falla también cuentan en el motor
+        db = MockDatabase.return_value
+        db.conectar.return_value = True
+        db.obtener_columnas_numericas.return_value = ["temperature"]
+        db.obtener_registros_con_errores.return_value = [
+            (5, "2023-01-01 12:00", -32768),
+            (6, "2023-01-01 13:00", -32768),
+        ]
+        db.obtener_valor_anterior.return_value = 10.0
+        db.obtener_valor_posterior.return_value = 20.0
+        db.actualizar_observacion.side_effect = [True, False]
+
+        correcciones, filas, tiempo = procesar_estacion(99, CONFIG_PRUEBA)
+
+        self.assertEqual(correcciones, 1)
+        self.assertEqual(filas, 2)
+        self.assertGreaterEqual(tiempo, 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()